@@ -1,9 +1,17 @@
 import os
 import json
+import base64
+import math
+import functools
 import numpy as np
 import logging
 from typing import Any, Dict, List, Union, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -11,87 +19,200 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Arrays with more elements than this are written as base64-encoded raw bytes
+NDARRAY_BASE64_THRESHOLD = 4096
+
+def encode_ndarray(arr: np.ndarray) -> Union[List[Any], Dict[str, Any]]:
+    """Convert a NumPy array to a JSON-serializable object.
+    
+    Small arrays become (nested) lists so the output stays human-readable.
+    Arrays larger than ``NDARRAY_BASE64_THRESHOLD`` elements are stored as
+    ``{"__ndarray__": <base64 bytes>, "dtype": ..., "shape": [...]}``, which
+    avoids boxing every element as a Python float; see ``decode_ndarray``.
+    
+    Args:
+        arr: NumPy array to convert
+        
+    Returns:
+        List for small arrays, base64 sentinel dictionary for large arrays
+    """
+    if arr.size <= NDARRAY_BASE64_THRESHOLD or arr.dtype.hasobject:
+        return arr.tolist()
+    return {
+        "__ndarray__": base64.b64encode(np.ascontiguousarray(arr).tobytes()).decode('ascii'),
+        "dtype": arr.dtype.str,
+        "shape": list(arr.shape),
+    }
+
+def decode_ndarray(obj: Dict[str, Any]) -> Any:
+    """Restore NumPy arrays written by ``encode_ndarray``.
+    
+    Intended as an ``object_hook`` for ``json.load``; dictionaries without the
+    ``__ndarray__`` sentinel are returned unchanged.
+    
+    Args:
+        obj: Decoded JSON object
+        
+    Returns:
+        NumPy array if obj is a base64 array sentinel, otherwise obj
+    """
+    if isinstance(obj, dict) and "__ndarray__" in obj:
+        data = base64.b64decode(obj["__ndarray__"])
+        return np.frombuffer(data, dtype=np.dtype(obj["dtype"])).reshape(obj["shape"]).copy()
+    return obj
+
+def decode_complex(value: Any) -> Any:
+    """Restore complex numbers written as ``[real, imag]`` pairs.
+    
+    Nested lists (e.g. complex arrays written as lists) are decoded
+    recursively; use ``np.asarray`` on the result to get an array back.
+    
+    Args:
+        value: ``[real, imag]`` pair or (nested) list of such pairs
+        
+    Returns:
+        Complex number, or nested list of complex numbers
+    """
+    if len(value) == 2 and all(isinstance(v, (int, float)) for v in value):
+        return complex(value[0], value[1])
+    return [decode_complex(v) for v in value]
+
 class ComplexEncoder(json.JSONEncoder):
     """Custom JSON encoder for complex numbers and NumPy arrays.
     
-    Handles serialization of complex numbers and NumPy arrays that are not
-    natively supported by the standard JSON encoder.
+    Handles serialization of complex numbers, NumPy arrays and NumPy scalars
+    that are not natively supported by the standard JSON encoder, so nested
+    dictionaries can be streamed by ``json.dump`` without a conversion pass.
+    Complex numbers are written as ``[real, imag]`` pairs; see
+    ``decode_complex``.
     """
     def default(self, obj):
         if isinstance(obj, complex):
-            return {"real": obj.real, "imag": obj.imag}
+            return [obj.real, obj.imag]
         if isinstance(obj, np.ndarray):
-            return obj.tolist()
+            return encode_ndarray(obj)
+        if isinstance(obj, np.generic):
+            return obj.item()
         # Let the base class default method raise the TypeError
         return json.JSONEncoder.default(self, obj)
 
-def convert_for_json(obj: Any) -> Any:
-    """Recursively convert objects for JSON serialization.
-    
-    Converts:
-        - NumPy arrays → lists
-        - Items inside dicts and lists → recursively converted
-    
-    Args:
-        obj: Object to convert for JSON serialization
-        
-    Returns:
-        JSON-serializable object
-    """
+def _orjson_default(obj: Any) -> Any:
+    """Fallback serializer for objects orjson does not handle natively."""
+    if isinstance(obj, complex):
+        return [obj.real, obj.imag]
+    if isinstance(obj, np.ndarray):
+        return encode_ndarray(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return True if obj holds a NaN or infinity that would be written as a list item or scalar."""
     if isinstance(obj, dict):
-        return {k: convert_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_for_json(item) for item in obj]
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, complex):
-        return {"real": obj.real, "imag": obj.imag}
-    return obj
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if isinstance(obj, (float, np.floating)):
+        return not math.isfinite(obj)
+    if isinstance(obj, (complex, np.complexfloating)):
+        return not (math.isfinite(obj.real) and math.isfinite(obj.imag))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            return any(_has_non_finite(v) for v in obj.ravel())
+        # Base64-encoded arrays keep their values bit-for-bit
+        if obj.dtype.kind in 'fc' and obj.size <= NDARRAY_BASE64_THRESHOLD:
+            return not np.isfinite(obj).all()
+    return False
 
 def write_to_json(dict_name: Dict[str, Any], json_name: str) -> None:
     """Save a dictionary to a JSON file.
     
     Handles:
         - Nested dictionaries
-        - NumPy arrays
-        - Complex numbers
+        - NumPy arrays (large arrays as base64, see ``encode_ndarray``)
+        - Complex numbers (as ``[real, imag]`` pairs)
         - Automatic directory creation
     
+    Uses orjson when available and falls back to the standard library encoder
+    otherwise; either way the encoded document is written in a single call.
+    orjson would write NaN and infinity as ``null``, so data containing them is
+    always encoded by the standard library (as ``NaN``/``Infinity``) and the
+    output does not depend on whether orjson is installed.
+    
     Args:
         dict_name: Dictionary to save
         json_name: Path to the output JSON file
     """
     try:
-        converted_dict = convert_for_json(dict_name)
-        
         # Create directories if they do not exist
         os.makedirs(os.path.dirname(json_name), exist_ok=True)
         
-        with open(json_name, 'w') as f:
-            json.dump(converted_dict, f, cls=ComplexEncoder, indent=2)
+        data = None
+        if orjson is not None:
+            data = orjson.dumps(
+                dict_name,
+                default=_orjson_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            )
+            # NaN/inf come out as null; only walk the data when that can have happened
+            if b'null' in data and _has_non_finite(dict_name):
+                data = None
+        if data is None:
+            data = json.dumps(dict_name, cls=ComplexEncoder, indent=2).encode('utf-8')
+        
+        with open(json_name, 'wb', buffering=1 << 20) as f:
+            f.write(data)
         
         logger.info(f"Parameters saved to {json_name}")
     except Exception as e:
         logger.error(f"Failed to save parameters to {json_name}: {e}")
         raise
 
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON config file; cached per (absolute path, modification time)."""
+    with open(path) as f:
+        return json.load(f)
+
+def load_config(path: str = "config.json") -> Dict[str, Any]:
+    """Load user settings from a JSON configuration file.
+    
+    The parsed content is cached and only re-read when the file's modification
+    time changes, so repeated simulation calls in a sweep do not re-parse it.
+    
+    Args:
+        path: Path to the JSON configuration file
+        
+    Returns:
+        Dictionary with the configuration settings (a copy of the cached entry)
+        
+    Raises:
+        FileNotFoundError: If the configuration file doesn't exist
+        json.JSONDecodeError: If the configuration file is not valid JSON
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {path}")
+    # Absolute path, so a chdir to another config.json can't hit a stale entry
+    return dict(_load_config_cached(os.path.abspath(path), st.st_mtime_ns))
+
 def find_closest(lst: List[float], target: float) -> Tuple[float, int]:
     """Find the value and index of the item in a list closest to a given target.
 
     Args:
-        lst: List of numeric values
+        lst: List or array of numeric values
         target: Target value to find closest match for
 
     Returns:
         Tuple containing (closest_value, index_of_closest_value)
     """
-    if not lst:
+    arr = np.asarray(lst)
+    if arr.size == 0:
         raise ValueError("Input list cannot be empty")
     
-    lst = list(lst)
-    closest_value = min(lst, key=lambda x: abs(x - target))
-    closest_index = lst.index(closest_value)
-    return closest_value, closest_index
+    closest_index = int(np.argmin(np.abs(arr - target)))
+    return arr[closest_index].item(), closest_index
 
 def validate_file_path(file_path: str, file_type: str = "file") -> bool:
     """Validate that a file path exists and is accessible.
@@ -105,12 +226,14 @@ def validate_file_path(file_path: str, file_type: str = "file") -> bool:
         
     Raises:
         FileNotFoundError: If file doesn't exist
+        PermissionError: If file is not readable by this process
     """
+    # One access() call on the common path; exists() only to pick the error
+    if os.access(file_path, os.R_OK):
+        return True
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"{file_type} file not found: {file_path}")
-    if not os.access(file_path, os.R_OK):
-        raise PermissionError(f"Cannot read {file_type} file: {file_path}")
-    return True
+    raise PermissionError(f"Cannot read {file_type} file: {file_path}")
 
 def ensure_directory_exists(directory_path: str) -> None:
     """Ensure a directory exists, creating it if necessary.
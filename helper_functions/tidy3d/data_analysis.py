@@ -11,17 +11,20 @@ logger = logging.getLogger(__name__)
 def read_mode_monitor_from_file(
     fname: str | None = None,
     monitor: str | None = None,
+    mode_index: int | None = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Read mode monitor data from a Tidy3D simulation file.
     
     Args:
         fname: Path to the simulation data file (.hdf5)
         monitor: Name of the mode monitor to extract data from
+        mode_index: If given, only this mode is selected and converted
         
     Returns:
-        Tuple of (wavelengths, mode_coefficients) where:
+        Tuple of C-contiguous NumPy arrays (wavelengths, mode_coefficients) where:
             - wavelengths: Array of wavelengths in micrometers
-            - mode_coefficients: Array of mode power coefficients (normalized)
+            - mode_coefficients: Array of mode power coefficients (normalized),
+              shape (frequencies, modes), or (frequencies,) if mode_index is given
             
     Raises:
         FileNotFoundError: If simulation file is not found
@@ -36,14 +39,19 @@ def read_mode_monitor_from_file(
     try:
         sim_data = td.SimulationData.from_file(fname)
         mode_data = sim_data[monitor]
-        coeffs = np.abs(mode_data.amps.sel(direction="+"))**2
+        amps = mode_data.amps.sel(direction="+")
+        if mode_index is not None:
+            # select before squaring so only the requested mode is computed
+            amps = amps.sel(mode_index=mode_index)
+        # |a|^2 without the sqrt/square round trip of np.abs(amps)**2
+        coeffs = amps.real**2 + amps.imag**2
         lambdas = td.C_0 / mode_data.amps.f
         
         logger.info(f"Successfully read mode data from {fname}, monitor: {monitor}")
         logger.info(f"Wavelength range: {lambdas.min():.3f} - {lambdas.max():.3f} μm")
         logger.info(f"Number of modes: {coeffs.shape[1] if len(coeffs.shape) > 1 else 1}")
         
-        return lambdas, coeffs
+        return np.ascontiguousarray(lambdas.values), np.ascontiguousarray(coeffs.values)
         
     except FileNotFoundError:
         logger.error(f"Simulation file not found: {fname}")
@@ -6,7 +6,7 @@ from tidy3d.plugins.dispersion import FastDispersionFitter, AdvancedFastFitterPa
 import matplotlib.pyplot as plt
 import json
 import logging
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 
 from tidy3d.plugins.dispersion import AdvancedFitterParam
 from tidy3d.plugins.dispersion.web import run as run_fitter
@@ -19,7 +19,8 @@ def fit_pole_residue_material(filename: str,
                               k_name: str,
                               material_name: str,
                               wav_range: Tuple[float, float] = (0.4, 2.0),
-                              web_service: bool = False) -> None:
+                              web_service: bool = False,
+                              plot: Union[bool, str] = 'save') -> None:
     """Perform dispersion fitting on n, k data and save fitting result to a JSON file.
     
     Args:
@@ -30,6 +31,8 @@ def fit_pole_residue_material(filename: str,
         material_name: Name of the material
         wav_range: Wavelength range for fitting (min, max) in micrometers
         web_service: Whether to use web service for fitting
+        plot: 'save' writes the fit plot next to output_file (<stem>_fit.png),
+            'show' opens a blocking window, False skips plotting
         
     Raises:
         FileNotFoundError: If input file is not found
@@ -74,9 +77,15 @@ def fit_pole_residue_material(filename: str,
 
         print(f"RMS error: {rms_error:.6f}")    
 
-        fitter.plot(medium)
-        plt.xlabel('wavelength (um)')
-        plt.show()
+        if plot:
+            fitter.plot(medium)
+            plt.xlabel('wavelength (um)')
+            fig = plt.gcf()
+            if plot == 'show':
+                plt.show()
+            else:
+                fig.savefig(os.path.splitext(output_file)[0]+'_fit.png', dpi=150)
+            plt.close(fig)
         
         medium.to_file(output_file)
         logger.info(f"Fitted material saved to {output_file}")
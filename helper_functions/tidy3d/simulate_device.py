@@ -1,11 +1,15 @@
 from datetime import datetime
 import gdsfactory as gf
+import tidy3d as td
 import os
+import sys
+import shutil
 import json
 import logging
+from pathlib import Path
 from typing import Dict, Any, Optional
 
-from helper_functions.generic.misc import write_to_json, validate_file_path, ensure_directory_exists
+from helper_functions.generic.misc import write_to_json, validate_file_path, ensure_directory_exists, load_config
 from helper_functions.tidy3d.initiate_fdtd import fdtd_from_gds
 
 logger = logging.getLogger(__name__)
@@ -36,6 +40,11 @@ def simulate_predefined_gds(parameters: Dict[str, Any]) -> Optional[Dict[str, An
             - flag_boolean: Whether to apply boolean operations
             - solver_z_min/max: Simulation region z bounds
             - change_cladding: Whether to change top cladding to Si3N4
+            - rewrite_gds: Re-emit the GDS through gdsfactory instead of copying the
+              .gds and its .yml metadata sidecar (always done if there is no sidecar)
+            - overwrite: Policy for existing output: 'ask' prompts, 'reuse' loads the existing
+              results file without re-running, 'skip' returns None, 'overwrite' re-runs and
+              replaces it; 'ask' falls back to 'reuse' when stdin is not an interactive terminal
 
     Returns:
         Dictionary containing simulation results if flag_run_simulation is True,
@@ -66,12 +75,13 @@ def simulate_predefined_gds(parameters: Dict[str, Any]) -> Optional[Dict[str, An
         solver_z_min = -1,      # simulation region z min (um)
         solver_z_max = 1,       # simulation region z max (um)
         change_cladding = False,        # True: replace top cladding with Si3N4
+        rewrite_gds = False,            # True: re-emit GDS via gdsfactory instead of a file copy
+        overwrite = 'ask',              # existing output: 'ask', 'reuse', 'skip' or 'overwrite'
     )
 
     try:
         # Load user settings from config.json
-        with open("config.json") as f:
-            config = json.load(f)
+        config = load_config("config.json")
         p.update(config)
     except FileNotFoundError:
         logger.warning("config.json not found, using default parameters")
@@ -85,6 +95,8 @@ def simulate_predefined_gds(parameters: Dict[str, Any]) -> Optional[Dict[str, An
     # Validate required parameters
     if not p.get('predefined_gds'):
         raise ValueError("GDS file path must be specified")
+    if p['overwrite'] not in ('ask', 'reuse', 'skip', 'overwrite'):
+        raise ValueError(f"Unknown overwrite policy: {p['overwrite']}. Use 'ask', 'reuse', 'skip' or 'overwrite'")
     
     # Validate file paths
     try:
@@ -95,30 +107,48 @@ def simulate_predefined_gds(parameters: Dict[str, Any]) -> Optional[Dict[str, An
     
     p['gds_file'] = p['file_name']+'.gds'
 
-    # Convert settings to local variables for backward compatibility
-    for key, value in p.items():
-        globals()[key] = value
-        
     # Save parameters to a json file
     try:
-        write_to_json(dict_name=p, json_name=file_name+'.json')
+        write_to_json(dict_name=p, json_name=p['file_name']+'.json')
     except Exception as e:
         logger.error(f"Failed to save parameters: {e}")
         raise
 
     # Copy the predefined GDS to the output location
     try:
-        device = gf.import_gds(predefined_gds, read_metadata=True)
-        device.write_gds(gds_file, with_metadata=True)
-        logger.info(f"GDS file copied to {gds_file}")
+        # Port definitions live in the .yml sidecar; a plain copy is only
+        # possible when it exists, otherwise gdsfactory re-emits it
+        metadata_file = Path(p['predefined_gds']).with_suffix('.yml')
+        if p['rewrite_gds'] or not metadata_file.exists():
+            device = gf.import_gds(p['predefined_gds'], read_metadata=True)
+            device.write_gds(p['gds_file'], with_metadata=True)
+        else:
+            shutil.copy2(p['predefined_gds'], p['gds_file'])
+            shutil.copy2(metadata_file, Path(p['gds_file']).with_suffix('.yml'))
+        logger.info(f"GDS file copied to {p['gds_file']}")
     except Exception as e:
         logger.error(f"Failed to import/copy GDS file: {e}")
         raise RuntimeError(f"GDS file processing failed: {e}")
 
     # Check if the simulation file already exists
-    simulation_file = file_name+'_results.hdf5'
+    simulation_file = p['file_name']+'_results.hdf5'
     if os.path.exists(simulation_file):
         logger.warning(f"Simulation results file already exists: {simulation_file}")
+        overwrite = p['overwrite']
+        if overwrite == 'ask' and (sys.stdin is None or not sys.stdin.isatty()):
+            logger.info("No interactive terminal, reusing existing simulation results file")
+            overwrite = 'reuse'
+        if overwrite == 'reuse':
+            # Load the existing results instead of re-running (and re-paying for) the job
+            logger.info(f"Loading existing simulation results without re-running: {simulation_file}")
+            return td.SimulationData.from_file(simulation_file)
+        elif overwrite == 'overwrite':
+            logger.info("Re-running simulation, existing output will be replaced")
+            results = fdtd_from_gds(parameters=p)
+            return results
+        elif overwrite == 'skip':
+            logger.info("Skipping simulation, output already exists")
+            return None
         while True:
             try:
                 response = input("Do you want to continue? (y/n): ").strip().lower()
@@ -74,6 +74,8 @@ def main():
         flag_run_simulation = flag_run_simulation,
         # Control the top cladding: False, keep SiO2; True, change to Si3N4.
         change_cladding = False,
+        # Existing output: 'reuse' keeps it without re-running or prompting
+        overwrite = 'reuse',
     )
 
     logger.info(f"Starting directional coupler simulation with {solver} solver")
@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 import sys
+import atexit
+import functools
 from scipy.interpolate import CubicSpline
 
 current_directory = os.getcwd()
@@ -14,61 +16,75 @@ sys.path.append(lumapi_path)
 sys.path.append(os.path.dirname(__file__))
 import lumapi
 
-def read_lumerical_output(fname):
+@functools.lru_cache(maxsize=1)
+def _get_fdtd():
+    # one Lumerical session shared by all reads, closed at interpreter exit
     project = lumapi.FDTD()
+    atexit.register(project.close)
+    return project
+
+def read_lumerical_output(fname):
+    project = _get_fdtd()
     project.load(fname)
     temp = project.getresult("FDTD::ports::o2", "expansion for port monitor")
     T_net = temp["T_net"]
     wav = temp["lambda"][:,0]
 
     wav = wav*1e6
-    wav = np.flip(wav)
+    # CubicSpline needs strictly increasing wavelengths
+    idx = np.argsort(wav)
+    wav = wav[idx]
+    if np.any(np.diff(wav) <= 0):
+        raise ValueError(f"Wavelengths in {fname} are not strictly increasing after sorting")
 
-    T_TE0 = T_net[:, 0]
-    T_TE0 = T_TE0/np.max(T_TE0)
-    T_TE0 = np.flip(T_TE0)
+    # the fancy index already yields a new array, so normalize it in place
+    T_TE0 = T_net[idx, 0]
+    T_TE0 *= 1.0/T_TE0.max()
 
     return wav, T_TE0
 
 def read_tidy3d_output(fname):
-    wav, T = read_mode_monitor_from_file(fname, "o2 mode")
-    wav = np.flip(wav)
+    wav, T = read_mode_monitor_from_file(fname, "o2 mode", mode_index=0)
+    # CubicSpline needs strictly increasing wavelengths
+    idx = np.argsort(wav)
+    wav = wav[idx]
+    if np.any(np.diff(wav) <= 0):
+        raise ValueError(f"Wavelengths in {fname} are not strictly increasing after sorting")
     
-    T = T[:, 0].values
-    T = T/np.max(T)
-    T = np.flip(T)
+    # the fancy index already yields a new array, so normalize it in place
+    T = T[idx]
+    T *= 1.0/T.max()
 
     return wav, T
 
-def find_FWHM(wav, T):
+def find_FWHM(wav, T, plot='save', file_name='fwhm'):
+    # plot: 'save' writes <file_name>_fwhm.png, 'show' opens a blocking window, False skips plotting
 
     # interpolate to 1000 points
     wav_interp = np.linspace(np.min(wav), np.max(wav), 1000)
     T_interp = CubicSpline(wav, T)
+    Tv = T_interp(wav_interp)
 
-    plt.plot(wav_interp, T_interp(wav_interp), '-', color='orange')
-    plt.plot(wav, T, 'o', color='blue')
-    
     # find the half level
-    mini = np.min(T_interp(wav_interp))
+    mini = np.min(Tv)
     half_level = 0.5 + 0.5*mini
 
-    plt.hlines(half_level, np.min(wav_interp), np.max(wav_interp), color='black', linewidth=2)
-    
     # find the indices of the half level
+    below = Tv < half_level
+    above = Tv > half_level
     half_level_indices = [0, 0]
-    # first
-    for ii in range(len(wav_interp)):
-        if T_interp(wav_interp[ii]) < half_level and T_interp(wav_interp[ii-1]) > half_level and wav_interp[ii] > np.min(wav)+0.001 and wav_interp[ii] < np.max(wav)-0.005:
-            half_level_indices[0] = ii
-            print(f"First half level index: {half_level_indices[0]}")
-            break
-    # second
-    for ii in range(len(wav_interp)):
-        if T_interp(wav_interp[ii]) < half_level and T_interp(wav_interp[ii+1]) > half_level and wav_interp[ii] > np.min(wav)+0.005 and wav_interp[ii] < np.max(wav)-0.005:
-            half_level_indices[1] = ii
-            print(f"Second half level index: {half_level_indices[1]}")
-            break
+    # first: falling edge, index of the first point below the half level
+    first = below[1:] & above[:-1] & (wav_interp[1:] > np.min(wav)+0.001) & (wav_interp[1:] < np.max(wav)-0.005)
+    first = np.flatnonzero(first)
+    if first.size:
+        half_level_indices[0] = int(first[0]) + 1
+        print(f"First half level index: {half_level_indices[0]}")
+    # second: rising edge, index of the last point below the half level
+    second = below[:-1] & above[1:] & (wav_interp[:-1] > np.min(wav)+0.005) & (wav_interp[:-1] < np.max(wav)-0.005)
+    second = np.flatnonzero(second)
+    if second.size:
+        half_level_indices[1] = int(second[0])
+        print(f"Second half level index: {half_level_indices[1]}")
 
     # find the FWHM
     print(half_level_indices)
@@ -78,15 +94,22 @@ def find_FWHM(wav, T):
     peak_idx = int(np.round(np.average(half_level_indices)))
     peak_wav = wav_interp[peak_idx]
 
-
-    plt.axvspan(
-        wav_interp[half_level_indices[0]], 
-        wav_interp[half_level_indices[1]], 
-        color='red', alpha=0.3)
-
-    plt.plot(peak_wav, T_interp(peak_wav), 'o', color='green')
-    
-    plt.show()
+    if plot:
+        fig, ax = plt.subplots()
+        ax.plot(wav_interp, Tv, '-', color='orange')
+        ax.plot(wav, T, 'o', color='blue')
+        ax.hlines(half_level, np.min(wav_interp), np.max(wav_interp), color='black', linewidth=2)
+        ax.axvspan(
+            wav_interp[half_level_indices[0]], 
+            wav_interp[half_level_indices[1]], 
+            color='red', alpha=0.3)
+        ax.plot(peak_wav, Tv[peak_idx], 'o', color='green')
+
+        if plot == 'show':
+            plt.show()
+        else:
+            fig.savefig(f"{file_name}_fwhm.png", dpi=150)
+        plt.close(fig)
 
     return FWHM, peak_wav
     
@@ -101,7 +124,7 @@ if solver == "lumerical":
 elif solver == "tidy3d":
     wav, T = read_tidy3d_output(folder+file)
 
-FWHM, peak_wav = find_FWHM(wav, T)
+FWHM, peak_wav = find_FWHM(wav, T, plot='save', file_name=folder+os.path.splitext(file)[0])
 print(f"FWHM: {FWHM*1e3:.2f} nm")
 print(f"Peak wavelength: {peak_wav*1e3:.2f} nm")
 
@@ -10,13 +10,11 @@ from helper_functions.tidy3d.data_analysis import read_mode_monitor_from_file
 fname = "projects/FDTD_solvers/ring/Data/tidy3d/sweep_resolution/"
 file = "res20_span50_step5_results.hdf5"
 
-wav, T = read_mode_monitor_from_file(fname+file, "o2 mode")
+wav, T = read_mode_monitor_from_file(fname+file, "o2 mode", mode_index=0)
 
-T = T[:,0]
-T = T/np.max(T)
+np.multiply(T, 1.0/T.max(), out=T)
 
-for ii in range(len(T)):
-    print(T[ii].values)
+np.savetxt(sys.stdout, T, fmt='%.17g')
 
 
 